@@ -1,6 +1,5 @@
 import argparse
 import sys
-from core.package_updater import PackageUpdater
 
 
 async def update_main():
@@ -12,17 +11,23 @@ async def update_main():
 
     args = parser.parse_args()
 
+    # 延迟导入，--help 和参数错误时无需加载 yaml/pydantic/httpx
+    from core.package_updater import PackageUpdater
+
     updater = PackageUpdater()
 
-    if args.list:
-        updater.list_available_packages()
-        return
+    try:
+        if args.list:
+            updater.list_available_packages()
+            return
 
-    if args.package:
-        success = await updater.update_single_package(args.package)
-        sys.exit(0 if success else 1)
-    elif args.all:
-        await updater.update_all_packages()
-    else:
-        # 默认行为：更新所有包
-        await updater.update_all_packages()
+        if args.package:
+            success = await updater.update_single_package(args.package)
+            sys.exit(0 if success else 1)
+        elif args.all:
+            await updater.update_all_packages()
+        else:
+            # 默认行为：更新所有包
+            await updater.update_all_packages()
+    finally:
+        await updater.aclose()
@@ -1,6 +1,8 @@
 from enum import Enum
 
 DOWNLOAD_DIR = "downloads"
+# 下载和分块读写文件时的块大小（1 MiB），每次系统调用处理更多数据
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 
 
 class ArchEnum(Enum):
@@ -10,6 +12,10 @@ class ArchEnum(Enum):
     MIPS64EL = "mips64el"
 
 
+# 架构字符串到枚举的映射
+ARCH_BY_VALUE = {arch.value: arch for arch in ArchEnum}
+
+
 class PackageEnum(Enum):
     QQ = "qq"
     NAVICAT_PREMIUM_CS = "navicat-premium-cs"
@@ -20,12 +26,19 @@ class HashAlgorithmEnum(Enum):
 
     SHA256 = "sha256"
     SHA512 = "sha512"
+    # BLAKE2b-512，对应 PKGBUILD 中的 b2sums，比 SHA 系列更快
+    B2 = "b2"
 
     @classmethod
     def get_all(cls):
         """获取所有支持的哈希算法"""
         return [algo.value for algo in cls]
 
+    @classmethod
+    def get_defaults(cls):
+        """获取默认计算的哈希算法，b2 需要调用方显式指定"""
+        return [cls.SHA256.value, cls.SHA512.value]
+
 
 class ParserEnum(Enum):
     """解析器枚举"""
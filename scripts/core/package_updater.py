@@ -3,22 +3,51 @@
 整合fetch、parse和update三个流程
 """
 
+import asyncio
+from contextvars import ContextVar
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from constants.constants import DOWNLOAD_DIR, ParserEnum
-from fetcher.fetcher import Fetcher
+from constants.constants import (
+    DOWNLOAD_DIR,
+    HashAlgorithmEnum,
+    ParserEnum,
+)
 from loaders.config_loader import ConfigLoader, PackageConfig
 from parsers.base_parser import BaseParser
 from parsers.qq import QQParser
 from parsers.navicat import NavicatPremiumCSParser
 from updater.pkgbuild_editor import PKGBUILDEditor
+from utils.hash import download_and_hash_async
+
+if TYPE_CHECKING:
+    from fetcher.fetcher import Fetcher
+
+# 当前包的输出缓冲；并发更新多个包时，每个包的输出先缓存起来，完成后整体打印
+_log_lines: ContextVar[list[str] | None] = ContextVar("_log_lines", default=None)
+
+
+def _log(message: str) -> None:
+    """
+    输出更新过程中的日志
+
+    处于缓冲上下文中时写入当前包的缓冲，否则直接打印
+
+    Args:
+        message: 日志内容
+    """
+    lines = _log_lines.get()
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
 
 
 class PackageUpdater:
     """包更新器，整合fetch、parse和update流程"""
 
     def __init__(self):
-        self.fetcher = Fetcher()
         self.config = ConfigLoader.load_from_yaml()
         self.parsers: dict[str, BaseParser] = {
             ParserEnum.QQ.value: QQParser(),
@@ -30,6 +59,18 @@ class PackageUpdater:
         # PKGBUILD目录相对于项目根目录
         self.pkgbuild_root = self.project_root.parent
 
+    @cached_property
+    def fetcher(self) -> "Fetcher":
+        """HTTP请求器，首次使用时才创建，--list 等不联网的命令无需导入 httpx"""
+        from fetcher.fetcher import Fetcher
+
+        return Fetcher()
+
+    async def aclose(self) -> None:
+        """释放网络资源，未发起过请求时无需处理"""
+        if "fetcher" in self.__dict__:
+            await self.fetcher.aclose()
+
     def _get_pkgbuild_path(self, pkgbuild_relative_path: str) -> Path:
         """
         获取PKGBUILD文件的完整路径
@@ -64,55 +105,55 @@ class PackageUpdater:
         Returns:
             更新是否成功
         """
-        print(f"开始更新包: {package_name}")
+        _log(f"开始更新包: {package_name}")
 
         try:
             # 1. Fetch阶段：获取最新版本信息
-            print(f"  1. 从 {package_config.fetch_url} 获取版本信息...")
+            _log(f"  1. 从 {package_config.fetch_url} 获取版本信息...")
             response_data = await self.fetcher.fetch_text(package_config.fetch_url)
             if not response_data:
-                print(f"  错误: 无法获取版本信息")
+                _log(f"  错误: 无法获取版本信息")
                 return False
 
             # 2. Parse阶段：解析版本号和下载URL
-            print(f"  2. 解析版本信息...")
+            _log(f"  2. 解析版本信息...")
             parser = self.parsers.get(package_config.parser)
             if not parser:
-                print(f"  错误: 找不到解析器 {package_config.parser}")
+                _log(f"  错误: 找不到解析器 {package_config.parser}")
                 return False
 
             new_version = parser.parse_version(response_data)
             if not new_version:
-                print(f"  错误: 无法解析版本号")
+                _log(f"  错误: 无法解析版本号")
                 return False
 
-            print(f"  最新版本: {new_version}")
+            _log(f"  最新版本: {new_version}")
 
             # 3. 检查当前版本
             # 使用_get_pkgbuild_path方法获取正确的PKGBUILD路径
             pkgbuild_path = self._get_pkgbuild_path(package_config.pkgbuild)
-            print(f"  PKGBUILD路径: {pkgbuild_path}")
+            _log(f"  PKGBUILD路径: {pkgbuild_path}")
 
             if not pkgbuild_path.exists():
-                print(f"  错误: PKGBUILD文件不存在: {pkgbuild_path}")
+                _log(f"  错误: PKGBUILD文件不存在: {pkgbuild_path}")
                 return False
 
             editor = PKGBUILDEditor(pkgbuild_path)
             current_version = editor.get_pkgver()
-            print(f"  当前版本: {current_version}")
+            _log(f"  当前版本: {current_version}")
 
             if new_version == current_version:
-                print(f"  版本已是最新，无需更新")
+                _log(f"  版本已是最新，无需更新")
                 return True
 
             # 4. 下载文件并计算校验和
-            print(f"  3. 下载文件并计算校验和...")
+            _log(f"  3. 下载文件并计算校验和...")
             download_dir = Path(DOWNLOAD_DIR)
             download_dir.mkdir(exist_ok=True)
 
             # 获取包支持的架构
             supported_archs = package_config.get_supported_archs()
-            print(f"  支持的架构: {[arch.value for arch in supported_archs]}")
+            _log(f"  支持的架构: {[arch.value for arch in supported_archs]}")
 
             # 获取各架构的下载URL
             arch_urls = {}
@@ -121,105 +162,166 @@ class PackageUpdater:
                 if url:
                     arch_urls[arch.value] = url
                 else:
-                    print(f"  警告: 无法获取 {arch.value} 架构的下载URL")
+                    _log(f"  警告: 无法获取 {arch.value} 架构的下载URL")
 
             if not arch_urls:
-                print(f"  错误: 无法获取任何架构的下载URL")
+                _log(f"  错误: 无法获取任何架构的下载URL")
                 return False
 
-            # 下载各架构的文件并计算校验和
+            # PKGBUILD中已指向相同URL且有校验和的架构无需重新下载；
+            # 只有URL中包含新版本号（且不含旧版本号）时，相同URL才意味着相同文件，
+            # 不带版本号的URL在新版本发布后内容会变化，必须重新下载
             arch_checksums = {}
+            pending_urls = {}
             for arch, url in arch_urls.items():
-                filename = f"{package_name}_{new_version}_{arch}.deb"
-                file_path = download_dir / filename
-
-                print(f"    下载 {arch} 架构文件: {url}")
-                if not await self._download_file(url, file_path):
-                    print(f"    错误: 下载 {arch} 架构文件失败")
+                current_checksum = editor.get_checksum(arch)
+                versioned_url = new_version in url and (
+                    not current_version or current_version not in url
+                )
+                if (
+                    versioned_url
+                    and current_checksum
+                    and editor.get_source_url(arch) == url
+                ):
+                    _log(f"    {arch} 架构文件未变化，沿用现有校验和")
+                    arch_checksums[arch] = current_checksum
+                else:
+                    pending_urls[arch] = url
+
+            # 并发下载各架构的文件并计算校验和
+            results = await asyncio.gather(
+                *(
+                    self._fetch_and_hash(
+                        arch,
+                        url,
+                        download_dir / f"{package_name}_{new_version}_{arch}.deb",
+                    )
+                    for arch, url in pending_urls.items()
+                ),
+                return_exceptions=True,
+            )
+
+            for arch, result in zip(pending_urls, results):
+                if isinstance(result, BaseException):
+                    _log(f"    错误: 处理 {arch} 架构文件失败: {result}")
                     return False
-
-                # 计算校验和
-                checksum = await self._calculate_checksum(file_path)
-                arch_checksums[arch] = checksum
-                print(f"    {arch} 架构校验和: {checksum}")
+                arch_checksums[arch] = result
 
             # 5. 更新PKGBUILD
-            print(f"  4. 更新PKGBUILD...")
-            editor.update_pkgver(new_version)
-            editor.update_pkgrel(1)  # 重置pkgrel为1
+            _log(f"  4. 更新PKGBUILD...")
+            updates = {
+                "pkgver": new_version,
+                "pkgrel": "1",  # 重置pkgrel为1
+            }
 
             # 更新各架构的source和校验和
             for arch, url in arch_urls.items():
                 # 根据配置决定是否更新source URL
                 if package_config.update_source_url:
-                    editor.update_source_url(arch, url)
-                editor.update_arch_checksum(arch, arch_checksums[arch])
+                    updates[f"source_{arch}"] = f"('{url}')"
+                updates[f"sha512sums_{arch}"] = f"('{arch_checksums[arch]}')"
+
+            # 所有字段在一次扫描中完成替换
+            editor.apply_updates(updates)
 
             # 保存PKGBUILD
             editor.save()
-            print(f"  5. PKGBUILD已更新")
+            _log(f"  5. PKGBUILD已更新")
 
-            print(f"包 {package_name} 更新完成!")
+            _log(f"包 {package_name} 更新完成!")
             return True
 
         except Exception as e:
-            print(f"  错误: 更新包 {package_name} 时发生异常: {e}")
+            _log(f"  错误: 更新包 {package_name} 时发生异常: {e}")
             return False
 
-    async def _download_file(self, url: str, file_path: Path) -> bool:
+    async def _fetch_and_hash(self, arch: str, url: str, file_path: Path) -> str:
         """
-        下载文件
+        下载单个架构的文件并计算校验和
 
         Args:
+            arch: 架构名称
             url: 下载URL
             file_path: 保存路径
 
         Returns:
-            下载是否成功
-        """
-        try:
-            response = await self.fetcher.client.get(url)
-            response.raise_for_status()
+            文件的校验和
 
-            with open(file_path, "wb") as f:
-                f.write(response.content)
+        Raises:
+            RuntimeError: 如果下载失败
+        """
+        _log(f"    下载 {arch} 架构文件: {url}")
+        checksum = await self._download_and_hash(url, file_path)
+        if checksum is None:
+            raise RuntimeError(f"下载 {arch} 架构文件失败")
 
-            return True
-        except Exception as e:
-            print(f"下载文件失败: {e}")
-            return False
+        _log(f"    {arch} 架构校验和: {checksum}")
+        return checksum
 
-    async def _calculate_checksum(self, file_path: Path) -> str:
+    async def _download_and_hash(self, url: str, file_path: Path) -> str | None:
         """
-        计算文件的校验和
+        下载文件，并在写入的同时计算校验和
 
         Args:
-            file_path: 文件路径
+            url: 下载URL
+            file_path: 保存路径
 
         Returns:
-            SHA512校验和
+            SHA512校验和，如果下载失败则返回None
         """
-        from utils.hash import calculate_file_hash
-        from constants.constants import HashAlgorithmEnum
-
-        return calculate_file_hash(file_path, HashAlgorithmEnum.SHA512.value)
+        try:
+            # 边下载边哈希，省去再读一遍文件
+            return await download_and_hash_async(
+                self.fetcher.client, url, file_path, HashAlgorithmEnum.SHA512
+            )
+        except Exception as e:
+            _log(f"下载文件失败: {e}")
+            return None
 
     async def update_all_packages(self) -> None:
         """更新所有配置的包"""
         print("开始更新所有包...")
 
-        success_count = 0
         total_count = len(self.config.packages)
 
-        for package_name, package_config in self.config.packages.items():
-            print()
-            success = await self.update_package(package_name, package_config)
-            if success:
-                success_count += 1
+        # 各包之间互不依赖，并发执行；update_package 内部已捕获异常，
+        # 单个包失败不会取消其他包的任务
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                package_name: tg.create_task(
+                    self._update_package_buffered(package_name, package_config)
+                )
+                for package_name, package_config in self.config.packages.items()
+            }
+
+        success_count = sum(1 for task in tasks.values() if task.result())
 
         print()
         print(f"更新完成: {success_count}/{total_count} 个包更新成功")
 
+    async def _update_package_buffered(
+        self, package_name: str, package_config: PackageConfig
+    ) -> bool:
+        """
+        更新单个包，输出缓存到包更新结束后一次性打印，避免并发时各包的日志交错
+
+        Args:
+            package_name: 包名
+            package_config: 包配置
+
+        Returns:
+            更新是否成功
+        """
+        lines: list[str] = []
+        # 每个任务运行在独立的上下文副本中，这里的设置只影响当前包
+        token = _log_lines.set(lines)
+        try:
+            return await self.update_package(package_name, package_config)
+        finally:
+            _log_lines.reset(token)
+            print()
+            print("\n".join(lines))
+
     async def update_single_package(self, package_name: str) -> bool:
         """
         更新单个指定的包
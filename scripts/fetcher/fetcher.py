@@ -1,5 +1,6 @@
+from importlib.util import find_spec
 from typing import Any
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits
 
 
 DEFAULT_HEADERS = {
@@ -8,6 +9,14 @@ DEFAULT_HEADERS = {
     "Cache-Control": "no-cache",
 }
 
+# 多个包并发更新时共用同一个连接池，默认的连接数上限会成为瓶颈
+DEFAULT_LIMITS = Limits(
+    max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0
+)
+
+# HTTP/2 依赖可选的 h2 包（httpx[http2]），未安装时退回 HTTP/1.1
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
 
 class Fetcher:
     """
@@ -15,13 +24,26 @@ class Fetcher:
     """
 
     def __init__(
-        self, timeout: int = 10, headers: dict[str, str] | None = None
+        self,
+        timeout: int = 10,
+        headers: dict[str, str] | None = None,
+        limits: Limits = DEFAULT_LIMITS,
     ) -> None:
         merged_headers = DEFAULT_HEADERS.copy()
         if headers:
             merged_headers.update(headers)
 
-        self.client = AsyncClient(timeout=timeout, headers=merged_headers)
+        self.client = AsyncClient(
+            timeout=timeout,
+            headers=merged_headers,
+            limits=limits,
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=True,
+        )
+
+    async def aclose(self) -> None:
+        """关闭底层连接池"""
+        await self.client.aclose()
 
     async def fetch_json(
         self, url: str, headers: dict[str, str] | None = None
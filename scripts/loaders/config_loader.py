@@ -1,7 +1,18 @@
+import hashlib
+import json
+import os
+import pickle
+from functools import cached_property
+from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List
-import yaml
-from constants.constants import ArchEnum
+from constants.constants import ARCH_BY_VALUE, ArchEnum
+
+
+def get_config_cache_dir() -> Path:
+    """获取配置解析结果的缓存目录"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "aur-packages"
 
 
 class PackageConfig(BaseModel):
@@ -21,15 +32,14 @@ class PackageConfig(BaseModel):
         extra = "ignore"
         validate_by_name = True
 
+    @cached_property
+    def supported_archs(self) -> List[ArchEnum]:
+        """支持的架构枚举列表，忽略未知的架构"""
+        return [ARCH_BY_VALUE[arch] for arch in self.arch if arch in ARCH_BY_VALUE]
+
     def get_supported_archs(self) -> List[ArchEnum]:
         """获取支持的架构枚举列表"""
-        supported_archs = []
-        for arch_str in self.arch:
-            for arch_enum in ArchEnum:
-                if arch_enum.value == arch_str:
-                    supported_archs.append(arch_enum)
-                    break
-        return supported_archs
+        return self.supported_archs
 
 
 class ConfigLoader(BaseModel):
@@ -40,7 +50,57 @@ class ConfigLoader(BaseModel):
 
     @classmethod
     def load_from_yaml(cls, filepath: str = "packages.yaml") -> "ConfigLoader":
-        """从 YAML 文件加载"""
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        return cls(**data)
+        """
+        从 YAML 文件加载
+
+        解析结果按模型结构和文件内容的SHA256缓存到本地，两者都不变时直接读取缓存，跳过YAML解析；
+        模型字段变化后旧缓存自动失效
+
+        Args:
+            filepath: 配置文件路径
+
+        Returns:
+            配置加载器实例
+        """
+        with open(filepath, "rb") as f:
+            raw = f.read()
+
+        # 模型的 JSON Schema 包含所有字段及其类型，字段增删改都会改变缓存键
+        schema = json.dumps(cls.model_json_schema(), sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(schema + raw).hexdigest()
+        cache_prefix = Path(filepath).name
+        cache_path = get_config_cache_dir() / f"{cache_prefix}.{digest}.pkl"
+
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if isinstance(cached, cls):
+                return cached
+        except Exception:
+            # 缓存不存在或已损坏，重新解析
+            pass
+
+        # 只在缓存未命中时才导入 yaml，缩短 CLI 启动时间
+        import yaml
+
+        # 优先使用 libyaml 实现的 C 加载器，未编译 libyaml 时回退到纯 Python 版本
+        try:
+            from yaml import CSafeLoader as YamlLoader
+        except ImportError:
+            from yaml import SafeLoader as YamlLoader
+
+        data = yaml.load(raw.decode("utf-8"), Loader=YamlLoader)
+        config = cls(**data)
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, "wb") as f:
+                pickle.dump(config, f)
+            # 清理同一配置文件的旧缓存，避免每次修改配置都残留一个文件
+            for stale in cache_path.parent.glob(f"{cache_prefix}.*.pkl"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"写入配置缓存失败: {e}")
+
+        return config
@@ -3,6 +3,10 @@ import re
 from constants.constants import ArchEnum, NAVICAT_URLS
 from .base_parser import BaseParser
 
+VERSION_PATTERN = re.compile(
+    r"(Navicat[^()]*\(Linux\)[^v]*version[^\d]*)(\d+\.\d+\.\d+)", re.IGNORECASE
+)
+
 
 class NavicatPremiumCSParser(BaseParser):
     def parse_version(self, response_data: str | Any) -> str | None:
@@ -15,8 +19,7 @@ class NavicatPremiumCSParser(BaseParser):
         Returns:
             Navicat 版本号字符串，如果解析失败则返回None
         """
-        pattern = r"(Navicat[^()]*\(Linux\)[^v]*version[^\d]*)(\d+\.\d+\.\d+)"
-        matched = re.search(pattern, response_data, re.IGNORECASE)
+        matched = VERSION_PATTERN.search(response_data)
         if matched:
             return matched.group(2)
         return None
@@ -1,8 +1,25 @@
 from typing import Any
-import re, json
+import re
 from constants.constants import ArchEnum
 from .base_parser import BaseParser
 
+# 优先使用 orjson 解析 JSON，未安装时回退到标准库
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+PARAMS_PATTERN = re.compile(r"var params\s*=\s*(\{.*?\});", re.DOTALL)
+VERSION_PATTERN = re.compile(r"QQ_([\d._]+)_amd64")
+
+# 各架构在 params 中对应的字段名，以及该字段是否可能直接是URL字符串（而非字典）
+ARCH_DOWNLOAD_KEYS: dict[str, tuple[str, bool]] = {
+    ArchEnum.X86_64.value: ("x64DownloadUrl", False),
+    ArchEnum.AARCH64.value: ("armDownloadUrl", False),
+    ArchEnum.LOONG64.value: ("loongarchDownloadUrl", True),
+    ArchEnum.MIPS64EL.value: ("mipsDownloadUrl", True),
+}
+
 
 class QQParser(BaseParser):
     def parse_version(self, response_data: str | Any) -> str | None:
@@ -17,8 +34,7 @@ class QQParser(BaseParser):
         url = self.parse_url(ArchEnum.X86_64, response_data)  # 默认使用x86_64架构
         if not url:
             return None
-        pattern = r"QQ_([\d._]+)_amd64"
-        matched = re.search(pattern, url)
+        matched = VERSION_PATTERN.search(url)
         if matched:
             return matched.group(1)
         return None
@@ -36,31 +52,22 @@ class QQParser(BaseParser):
         # 如果传入的是枚举，获取其值
         arch_value = arch.value if isinstance(arch, ArchEnum) else arch
 
-        pattern = r"var params\s*=\s*(\{.*?\});"
-        matched = re.search(pattern, response_data, re.DOTALL)
+        download_key = ARCH_DOWNLOAD_KEYS.get(arch_value)
+        if download_key is None:
+            return None
+        key, maybe_scalar = download_key
+
+        matched = PARAMS_PATTERN.search(response_data)
 
         if matched:
             try:
-                result: dict[str, dict[str, str]] = json.loads(matched.group(1))
-                match arch_value:
-                    case ArchEnum.X86_64.value:
-                        return result.get("x64DownloadUrl", {}).get("deb")
-                    case ArchEnum.AARCH64.value:
-                        return result.get("armDownloadUrl", {}).get("deb")
-                    case ArchEnum.LOONG64.value:
-                        loongarch_url = result.get("loongarchDownloadUrl")
-                        # loongarchDownloadUrl 可能是字符串或字典
-                        if isinstance(loongarch_url, dict):
-                            return loongarch_url.get("deb")
-                        return loongarch_url
-                    case ArchEnum.MIPS64EL.value:
-                        mips_url = result.get("mipsDownloadUrl")
-                        # mipsDownloadUrl 可能是字符串或字典
-                        if isinstance(mips_url, dict):
-                            return mips_url.get("deb")
-                        return mips_url
-
-            except json.JSONDecodeError:
+                result: dict[str, Any] = json_loads(matched.group(1))
+                download_url = result.get(key)
+                # loongarch/mips 的下载地址可能是字符串或字典
+                if maybe_scalar and not isinstance(download_url, dict):
+                    return download_url
+                return (download_url or {}).get("deb")
+            except ValueError:
                 print(f"JSON解析失败: {matched.group(1)}")
 
         return None
@@ -0,0 +1,206 @@
+import hashlib
+from functools import partial
+from unittest.mock import patch
+import httpx
+import pytest
+from constants.constants import ArchEnum
+from core.package_updater import PackageUpdater
+from loaders.config_loader import ConfigLoader, PackageConfig
+from parsers.base_parser import BaseParser
+from updater.pkgbuild_editor import PKGBUILDEditor
+
+fetch_url = "https://example.com/latest"
+
+pkgbuild_text = """pkgname=fake
+pkgver=1.0
+pkgrel=3
+arch=('x86_64' 'aarch64')
+source_x86_64=('https://example.com/fake_1.0_x86_64.deb')
+source_aarch64=('https://example.com/fake_1.0_aarch64.deb')
+sha512sums_x86_64=('aaaa')
+sha512sums_aarch64=('bbbb')
+"""
+
+
+def file_content(arch: str) -> bytes:
+    return f"{arch}-payload".encode() * 10000
+
+
+class FakeParser(BaseParser):
+    """版本号即响应内容，下载URL中包含版本号"""
+
+    def parse_version(self, response_data):
+        return response_data.strip()
+
+    def parse_url(self, arch, response_data):
+        return f"https://example.com/fake_{response_data.strip()}_{arch.value}.deb"
+
+
+def make_package_config(pkgbuild, name: str = "fake") -> PackageConfig:
+    return PackageConfig(
+        name=name,
+        source=name,
+        fetch_url=f"{fetch_url}/{name}",
+        upstream="fake",
+        parser="FakeParser",
+        pkgbuild=str(pkgbuild),
+        arch=[ArchEnum.X86_64.value, ArchEnum.AARCH64.value],
+    )
+
+
+@pytest.fixture
+def pkgbuild(tmp_path):
+    path = tmp_path / "PKGBUILD"
+    path.write_text(pkgbuild_text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def make_updater(tmp_path, monkeypatch):
+    """创建使用模拟网络的更新器，下载目录位于临时目录"""
+    monkeypatch.chdir(tmp_path)
+
+    def factory(packages: dict[str, PackageConfig], handler) -> PackageUpdater:
+        config = ConfigLoader(packages=packages)
+        monkeypatch.setattr(
+            ConfigLoader, "load_from_yaml", classmethod(lambda cls: config)
+        )
+        updater = PackageUpdater()
+        updater.parsers = {"FakeParser": FakeParser()}
+
+        transport = httpx.MockTransport(handler)
+        with patch(
+            "fetcher.fetcher.AsyncClient",
+            partial(httpx.AsyncClient, transport=transport),
+        ):
+            # 提前创建 fetcher，使其使用模拟的传输层
+            updater.fetcher
+        return updater
+
+    return factory
+
+
+def make_handler(version: str = "2.0", failing_arch: str | None = None):
+    """返回最新版本号，按URL中的架构返回文件内容"""
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        requested.append(url)
+        if url.startswith(fetch_url):
+            return httpx.Response(200, text=version)
+        for arch in (ArchEnum.X86_64.value, ArchEnum.AARCH64.value):
+            if url.endswith(f"_{arch}.deb"):
+                if arch == failing_arch:
+                    return httpx.Response(404)
+                return httpx.Response(200, content=file_content(arch))
+        return httpx.Response(404)
+
+    return handler, requested
+
+
+@pytest.mark.asyncio
+async def test_update_package_downloads_and_hashes(pkgbuild, make_updater):
+    """并发下载各架构文件，PKGBUILD 中写入正确的 SHA512"""
+    handler, requested = make_handler()
+    updater = make_updater({"fake": make_package_config(pkgbuild)}, handler)
+
+    assert await updater.update_package("fake", make_package_config(pkgbuild))
+    await updater.aclose()
+
+    editor = PKGBUILDEditor(pkgbuild)
+    assert editor.get_pkgver() == "2.0"
+    assert editor.get_pkgrel() == 1
+    for arch in ("x86_64", "aarch64"):
+        assert editor.get_checksum(arch) == (
+            hashlib.sha512(file_content(arch)).hexdigest()
+        )
+        assert editor.get_source_url(arch) == (
+            f"https://example.com/fake_2.0_{arch}.deb"
+        )
+    assert len(requested) == 3
+
+
+@pytest.mark.asyncio
+async def test_update_package_arch_failure_keeps_pkgbuild(pkgbuild, make_updater):
+    """任一架构下载失败时中止更新，PKGBUILD 保持不变"""
+    handler, _ = make_handler(failing_arch="aarch64")
+    updater = make_updater({"fake": make_package_config(pkgbuild)}, handler)
+
+    assert not await updater.update_package("fake", make_package_config(pkgbuild))
+    await updater.aclose()
+
+    assert pkgbuild.read_text(encoding="utf-8") == pkgbuild_text
+
+
+@pytest.mark.asyncio
+async def test_update_all_packages_tally(tmp_path, pkgbuild, make_updater, capsys):
+    """统计成功数量，各包的输出不交错"""
+    broken = tmp_path / "broken" / "PKGBUILD"
+    handler, _ = make_handler()
+    updater = make_updater(
+        {
+            "fake": make_package_config(pkgbuild),
+            # PKGBUILD 不存在，更新失败
+            "broken": make_package_config(broken, name="broken"),
+        },
+        handler,
+    )
+
+    await updater.update_all_packages()
+    await updater.aclose()
+
+    output = capsys.readouterr().out
+    assert "更新完成: 1/2 个包更新成功" in output
+
+    blocks = [block for block in output.split("\n\n") if "开始更新包" in block]
+    assert len(blocks) == 2
+    for block in blocks:
+        assert block.count("开始更新包") == 1
+
+
+class UnversionedParser(FakeParser):
+    """下载URL中不包含版本号"""
+
+    def parse_url(self, arch, response_data):
+        return f"https://example.com/fake_{arch.value}.deb"
+
+
+@pytest.mark.asyncio
+async def test_update_package_reuses_checksum_for_versioned_url(pkgbuild, make_updater):
+    """PKGBUILD 已指向带新版本号的相同URL时沿用校验和，不再下载"""
+    pkgbuild.write_text(
+        pkgbuild_text.replace("fake_1.0_x86_64", "fake_2.0_x86_64"), encoding="utf-8"
+    )
+    handler, requested = make_handler()
+    updater = make_updater({"fake": make_package_config(pkgbuild)}, handler)
+
+    assert await updater.update_package("fake", make_package_config(pkgbuild))
+    await updater.aclose()
+
+    editor = PKGBUILDEditor(pkgbuild)
+    assert editor.get_checksum("x86_64") == "aaaa"
+    assert editor.get_checksum("aarch64") == (
+        hashlib.sha512(file_content("aarch64")).hexdigest()
+    )
+    assert "https://example.com/fake_2.0_x86_64.deb" not in requested
+
+
+@pytest.mark.asyncio
+async def test_update_package_redownloads_unversioned_url(pkgbuild, make_updater):
+    """URL不含版本号时即使与 PKGBUILD 相同也要重新下载"""
+    pkgbuild.write_text(pkgbuild_text.replace("fake_1.0_", "fake_"), encoding="utf-8")
+    handler, requested = make_handler()
+    updater = make_updater({"fake": make_package_config(pkgbuild)}, handler)
+    updater.parsers = {"FakeParser": UnversionedParser()}
+
+    assert await updater.update_package("fake", make_package_config(pkgbuild))
+    await updater.aclose()
+
+    editor = PKGBUILDEditor(pkgbuild)
+    assert editor.get_pkgver() == "2.0"
+    for arch in ("x86_64", "aarch64"):
+        assert editor.get_checksum(arch) == (
+            hashlib.sha512(file_content(arch)).hexdigest()
+        )
+    assert "https://example.com/fake_x86_64.deb" in requested
@@ -0,0 +1,81 @@
+import pytest
+import yaml
+from loaders.config_loader import ConfigLoader
+
+config_yaml = """
+packages:
+  qq:
+    name: qq
+    source: qq
+    fetch_url: "https://example.com/linuxConfig.js"
+    upstream: "Tencent/QQ"
+    parser: QQParser
+    pkgbuild: "packages/linuxqq-nt/PKGBUILD"
+    arch:
+      - x86_64
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    path = tmp_path / "packages.yaml"
+    path.write_text(config_yaml, encoding="utf-8")
+    return path
+
+
+def test_load_from_yaml_writes_cache(config_file, tmp_path):
+    """首次加载时写入缓存"""
+    config = ConfigLoader.load_from_yaml(str(config_file))
+
+    assert config.packages["qq"].parser == "QQParser"
+    assert len(list((tmp_path / "cache" / "aur-packages").glob("*.pkl"))) == 1
+
+
+def test_load_from_yaml_uses_cache(config_file, monkeypatch):
+    """文件内容不变时不再解析 YAML"""
+    ConfigLoader.load_from_yaml(str(config_file))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("不应再次解析 YAML")
+
+    monkeypatch.setattr("yaml.load", fail)
+    config = ConfigLoader.load_from_yaml(str(config_file))
+
+    assert config.packages["qq"].get_supported_archs()[0].value == "x86_64"
+
+
+def test_load_from_yaml_invalidates_on_change(config_file, tmp_path):
+    """文件内容变化后重新解析，并清理旧缓存"""
+    ConfigLoader.load_from_yaml(str(config_file))
+    config_file.write_text(
+        config_yaml.replace("name: qq", "name: linuxqq"), encoding="utf-8"
+    )
+
+    config = ConfigLoader.load_from_yaml(str(config_file))
+
+    assert config.packages["qq"].name == "linuxqq"
+    assert len(list((tmp_path / "cache" / "aur-packages").glob("*.pkl"))) == 1
+
+
+def test_load_from_yaml_invalidates_on_schema_change(config_file, monkeypatch):
+    """模型结构变化后不使用旧缓存"""
+    ConfigLoader.load_from_yaml(str(config_file))
+
+    schema = ConfigLoader.model_json_schema()
+    monkeypatch.setattr(
+        ConfigLoader,
+        "model_json_schema",
+        classmethod(lambda cls: {**schema, "title": "changed"}),
+    )
+    parsed = []
+    real_load = yaml.load
+    monkeypatch.setattr(
+        "yaml.load",
+        lambda *args, **kwargs: parsed.append(1) or real_load(*args, **kwargs),
+    )
+
+    config = ConfigLoader.load_from_yaml(str(config_file))
+
+    assert parsed
+    assert config.packages["qq"].name == "qq"
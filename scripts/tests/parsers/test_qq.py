@@ -0,0 +1,35 @@
+from constants.constants import ArchEnum
+from parsers.qq import QQParser
+
+linux_config_js = """
+var params = {
+    "x64DownloadUrl": {"deb": "https://example.com/QQ_3.2.22_251203_amd64_01.deb"},
+    "armDownloadUrl": {"deb": "https://example.com/QQ_3.2.22_251203_arm64_01.deb"},
+    "loongarchDownloadUrl": "https://example.com/QQ_3.2.22_251203_loongarch64_01.deb",
+    "mipsDownloadUrl": {"deb": "https://example.com/QQ_3.2.22_251203_mips64el_01.deb"}
+};
+"""
+
+
+def test_parse_version():
+    """从 x86_64 下载链接中提取版本号"""
+    assert QQParser().parse_version(linux_config_js) == "3.2.22_251203"
+
+
+def test_parse_url():
+    """各架构的下载链接，兼容字符串和字典两种格式"""
+    parser = QQParser()
+
+    assert parser.parse_url(ArchEnum.AARCH64, linux_config_js).endswith("_arm64_01.deb")
+    assert parser.parse_url("loong64", linux_config_js).endswith("_loongarch64_01.deb")
+    assert parser.parse_url(ArchEnum.MIPS64EL, linux_config_js).endswith(
+        "_mips64el_01.deb"
+    )
+
+
+def test_parse_url_unknown():
+    """未知架构或无法解析时返回 None"""
+    parser = QQParser()
+
+    assert parser.parse_url("i686", linux_config_js) is None
+    assert parser.parse_url(ArchEnum.X86_64, "var params = {invalid};") is None
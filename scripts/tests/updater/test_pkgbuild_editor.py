@@ -0,0 +1,159 @@
+import hashlib
+import stat
+from unittest.mock import patch
+import pytest
+from updater.pkgbuild_editor import PKGBUILDEditor
+
+pkgbuild_text = """pkgname=linuxqq-nt
+pkgver=3.2.22_251203
+pkgrel=2
+arch=('x86_64' 'aarch64')
+source_x86_64=('https://example.com/QQ_3.2.22_251203_amd64_01.deb')
+source_aarch64=('https://example.com/QQ_3.2.22_251203_arm64_01.deb')
+source=("linuxqq.sh")
+sha512sums=('aaaa')
+sha512sums_x86_64=('bbbb')
+sha512sums_aarch64=('cccc')
+"""
+
+
+@pytest.fixture
+def pkgbuild(tmp_path):
+    path = tmp_path / "PKGBUILD"
+    path.write_text(pkgbuild_text, encoding="utf-8")
+    return path
+
+
+def test_get_fields(pkgbuild):
+    """读取版本号和校验和"""
+    editor = PKGBUILDEditor(pkgbuild)
+
+    assert editor.get_pkgver() == "3.2.22_251203"
+    assert editor.get_pkgrel() == 2
+    assert editor.get_epoch() is None
+    assert editor.get_checksum() == "aaaa"
+    assert editor.get_checksum("aarch64") == "cccc"
+
+
+def test_update_and_save(pkgbuild):
+    """更新字段后写回文件"""
+    editor = PKGBUILDEditor(pkgbuild)
+    editor.update_pkgver("3.2.23_260101")
+    editor.update_pkgrel(1)
+    editor.update_source_url("x86_64", "https://example.com/QQ_3.2.23_amd64.deb")
+    editor.update_arch_checksum("x86_64", "dddd")
+    editor.save()
+
+    content = pkgbuild.read_text(encoding="utf-8")
+    assert "pkgver=3.2.23_260101\n" in content
+    assert "pkgrel=1\n" in content
+    assert "source_x86_64=('https://example.com/QQ_3.2.23_amd64.deb')\n" in content
+    assert "sha512sums_x86_64=('dddd')\n" in content
+    # 其他架构保持不变
+    assert "sha512sums_aarch64=('cccc')\n" in content
+
+
+def test_update_epoch_inserts_before_pkgver(pkgbuild):
+    """epoch 不存在时插入到 pkgver 之前"""
+    editor = PKGBUILDEditor(pkgbuild)
+    editor.update_epoch(5)
+
+    assert b"epoch=5\npkgver=3.2.22_251203\n" in editor.content
+    assert editor.get_epoch() == 5
+
+
+def test_apply_updates(pkgbuild):
+    """一次替换多个字段，未列出的字段保持不变"""
+    editor = PKGBUILDEditor(pkgbuild)
+    editor.apply_updates(
+        {
+            "pkgver": "3.2.23_260101",
+            "pkgrel": "1",
+            "source_aarch64": "('https://example.com/QQ_3.2.23_arm64.deb')",
+            "sha512sums_aarch64": "('dddd')",
+        }
+    )
+
+    assert editor.get_pkgver() == "3.2.23_260101"
+    assert editor.get_pkgrel() == 1
+    assert editor.get_checksum("aarch64") == "dddd"
+    assert editor.get_checksum("x86_64") == "bbbb"
+    assert editor.get_source_url("aarch64") == "https://example.com/QQ_3.2.23_arm64.deb"
+
+
+def test_save_without_changes_skips_write(pkgbuild):
+    """内容未变化时不写入文件"""
+    editor = PKGBUILDEditor(pkgbuild)
+    pkgbuild.write_text("modified elsewhere", encoding="utf-8")
+    editor.save()
+
+    assert pkgbuild.read_text(encoding="utf-8") == "modified elsewhere"
+
+
+def test_save_replaces_atomically(pkgbuild):
+    """保存后不残留临时文件"""
+    editor = PKGBUILDEditor(pkgbuild)
+    editor.update_pkgrel(3)
+    editor.save()
+
+    assert PKGBUILDEditor(pkgbuild).get_pkgrel() == 3
+    assert list(pkgbuild.parent.iterdir()) == [pkgbuild]
+
+
+def test_save_keeps_mode(pkgbuild):
+    """保存后保留原文件的权限"""
+    pkgbuild.chmod(0o600)
+    editor = PKGBUILDEditor(pkgbuild)
+    editor.update_pkgrel(3)
+    editor.save()
+
+    assert stat.S_IMODE(pkgbuild.stat().st_mode) == 0o600
+
+
+def test_save_failure_removes_tmp(pkgbuild):
+    """替换失败时删除临时文件，原文件不变"""
+    editor = PKGBUILDEditor(pkgbuild)
+    editor.update_pkgrel(3)
+
+    with patch("os.replace", side_effect=OSError("boom")):
+        with pytest.raises(OSError):
+            editor.save()
+
+    assert list(pkgbuild.parent.iterdir()) == [pkgbuild]
+    assert pkgbuild.read_text(encoding="utf-8") == pkgbuild_text
+
+
+def test_get_source_url(pkgbuild):
+    """读取特定架构的 source URL"""
+    editor = PKGBUILDEditor(pkgbuild)
+
+    assert editor.get_source_url("x86_64") == (
+        "https://example.com/QQ_3.2.22_251203_amd64_01.deb"
+    )
+    assert editor.get_source_url("loong64") == ""
+
+
+def test_get_formatted_checksums(pkgbuild):
+    """取出所有校验和字段"""
+    editor = PKGBUILDEditor(pkgbuild)
+
+    assert editor.get_formatted_checksums() == {
+        "sha512sums": "sha512sums=('aaaa')",
+        "sha512sums_x86_64": "sha512sums_x86_64=('bbbb')",
+        "sha512sums_aarch64": "sha512sums_aarch64=('cccc')",
+    }
+
+
+def test_get_file_checksums(pkgbuild, tmp_path):
+    """默认只计算 SHA 系列，字段名与算法对应"""
+    path = tmp_path / "qq.deb"
+    path.write_bytes(b"linuxqq")
+    sha256 = hashlib.sha256(b"linuxqq").hexdigest()
+    sha512 = hashlib.sha512(b"linuxqq").hexdigest()
+    editor = PKGBUILDEditor(pkgbuild)
+
+    assert editor.get_file_checksums(path) == {
+        "sha256": f"sha256sums=('{sha256}')",
+        "sha512": f"sha512sums=('{sha512}')",
+    }
+    assert editor.get_all_checksums(path) == {"sha256": sha256, "sha512": sha512}
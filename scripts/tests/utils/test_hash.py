@@ -0,0 +1,242 @@
+import io
+import hashlib
+from functools import partial
+from unittest.mock import patch
+import httpx
+import pytest
+from constants.constants import HashAlgorithmEnum
+from utils.hash import (
+    calculate_file_hash,
+    calculate_multiple_hashes,
+    download_and_verify,
+    download_and_verify_async,
+    download_many,
+    format_multiple_checksums_for_pkgbuild,
+    verify_file_hash,
+)
+
+file_content = b"linuxqq" * 100000
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    path = tmp_path / "sample.deb"
+    path.write_bytes(file_content)
+    return path
+
+
+def test_calculate_file_hash(sample_file):
+    """计算 SHA512/SHA256 哈希值"""
+    assert calculate_file_hash(sample_file) == hashlib.sha512(file_content).hexdigest()
+    assert (
+        calculate_file_hash(sample_file, "SHA256")
+        == hashlib.sha256(file_content).hexdigest()
+    )
+
+
+def test_calculate_file_hash_errors(sample_file, tmp_path):
+    """文件不存在或算法不支持时抛出异常"""
+    with pytest.raises(FileNotFoundError):
+        calculate_file_hash(tmp_path / "missing.deb")
+    with pytest.raises(FileNotFoundError):
+        calculate_multiple_hashes(tmp_path / "missing.deb")
+    with pytest.raises(ValueError):
+        calculate_file_hash(sample_file, "md5")
+
+
+def test_calculate_multiple_hashes(sample_file):
+    """一次计算多种哈希值"""
+    assert calculate_multiple_hashes(sample_file) == {
+        "sha256": hashlib.sha256(file_content).hexdigest(),
+        "sha512": hashlib.sha512(file_content).hexdigest(),
+    }
+
+
+def test_verify_file_hash(sample_file):
+    """校验哈希值，忽略大小写"""
+    expected = hashlib.sha512(file_content).hexdigest()
+
+    assert verify_file_hash(sample_file, expected.upper())
+    assert not verify_file_hash(sample_file, "0" * 128)
+
+
+def test_verify_file_hash_malformed_expected(sample_file):
+    """预期值长度或字符不合法时直接返回False，不读取文件"""
+    with patch("utils.hash.calculate_file_hash") as calculate:
+        assert not verify_file_hash(sample_file, "abc")
+        assert not verify_file_hash(sample_file, "z" * 128)
+        assert not verify_file_hash(sample_file, "0" * 64)
+        calculate.assert_not_called()
+
+
+def test_calculate_file_hash_large_file(tmp_path):
+    """大文件走 mmap 分支，结果一致"""
+    content = b"\x00\x01" * (6 * 1024 * 1024)
+    path = tmp_path / "large.deb"
+    path.write_bytes(content)
+
+    assert calculate_file_hash(path) == hashlib.sha512(content).hexdigest()
+
+
+def test_calculate_file_hash_empty_file(tmp_path):
+    """空文件"""
+    path = tmp_path / "empty.deb"
+    path.write_bytes(b"")
+
+    assert calculate_file_hash(path) == hashlib.sha512(b"").hexdigest()
+
+
+def test_download_and_verify(tmp_path):
+    """下载时同步计算哈希，不匹配时删除文件"""
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=file_content)
+    )
+    expected = hashlib.sha512(file_content).hexdigest()
+    destination = tmp_path / "downloads" / "qq.deb"
+
+    with patch(
+        "utils.hash._get_http_client", lambda: httpx.Client(transport=transport)
+    ):
+        assert download_and_verify("https://example.com/qq.deb", destination, expected)
+        assert destination.read_bytes() == file_content
+        # 下载时算出的哈希值已缓存，不会再读一遍文件
+        with patch("utils.hash._update_in_chunks", side_effect=AssertionError):
+            assert calculate_file_hash(destination) == expected
+
+        assert not download_and_verify(
+            "https://example.com/qq.deb", destination, "0" * 128
+        )
+        assert not destination.exists()
+
+
+def test_calculate_multiple_hashes_large_file(tmp_path):
+    """大文件走 mmap 分支，结果一致"""
+    content = b"\x00\x01" * (6 * 1024 * 1024)
+    path = tmp_path / "large.deb"
+    path.write_bytes(content)
+
+    assert calculate_multiple_hashes(path, ["sha512", "sha256"]) == {
+        "sha512": hashlib.sha512(content).hexdigest(),
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+
+
+def test_calculate_multiple_hashes_unsupported(sample_file):
+    """包含不支持的算法时抛出异常"""
+    with pytest.raises(ValueError):
+        calculate_multiple_hashes(sample_file, ["sha512", "md5"])
+
+
+def test_calculate_file_hash_b2(sample_file):
+    """BLAKE2b 与 b2sum 的结果一致"""
+    assert calculate_file_hash(sample_file, "b2") == (
+        hashlib.blake2b(file_content).hexdigest()
+    )
+
+
+def test_calculate_file_hash_cached(sample_file):
+    """文件未变化时直接返回缓存，变化后重新计算"""
+    expected = calculate_file_hash(sample_file)
+
+    with patch("utils.hash._update_in_chunks", side_effect=AssertionError):
+        assert calculate_file_hash(sample_file) == expected
+        assert calculate_multiple_hashes(sample_file, ["sha512"]) == {
+            "sha512": expected
+        }
+
+    sample_file.write_bytes(b"changed")
+    assert calculate_file_hash(sample_file) == hashlib.sha512(b"changed").hexdigest()
+
+
+def test_download_and_verify_truncated(tmp_path):
+    """实际大小与 Content-Length 不符时判定失败"""
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200, content=file_content, headers={"Content-Length": "1"}
+        )
+    )
+    expected = hashlib.sha512(file_content).hexdigest()
+    destination = tmp_path / "qq.deb"
+
+    with patch(
+        "utils.hash._get_http_client", lambda: httpx.Client(transport=transport)
+    ):
+        assert not download_and_verify(
+            "https://example.com/qq.deb", destination, expected
+        )
+        assert not destination.exists()
+
+
+@pytest.mark.asyncio
+async def test_download_and_verify_async(tmp_path):
+    """异步下载并校验"""
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=file_content)
+    )
+    expected = hashlib.sha512(file_content).hexdigest()
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert await download_and_verify_async(
+            "https://example.com/qq.deb", tmp_path / "qq.deb", expected, client=client
+        )
+    assert (tmp_path / "qq.deb").read_bytes() == file_content
+
+
+@pytest.mark.asyncio
+async def test_download_many(tmp_path):
+    """并发下载多个文件，结果顺序与输入一致"""
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, content=file_content)
+    )
+    expected = hashlib.sha512(file_content).hexdigest()
+
+    with patch("httpx.AsyncClient", partial(httpx.AsyncClient, transport=transport)):
+        results = await download_many(
+            [
+                {
+                    "url": "https://example.com/a.deb",
+                    "destination": tmp_path / "a.deb",
+                    "expected_hash": expected,
+                },
+                {
+                    "url": "https://example.com/b.deb",
+                    "destination": tmp_path / "b.deb",
+                    "expected_hash": "0" * 128,
+                },
+            ]
+        )
+
+    assert results == [True, False]
+    assert not (tmp_path / "b.deb").exists()
+
+
+def test_format_multiple_checksums_for_pkgbuild():
+    """按算法生成各架构及通用的校验和字段"""
+    assert format_multiple_checksums_for_pkgbuild({"x86_64": "aa"}, "bb") == {
+        "sha512sums_x86_64": "('aa')",
+        "sha512sums": "('bb')",
+    }
+    assert format_multiple_checksums_for_pkgbuild({"aarch64": "cc"}, algo="b2") == {
+        "b2sums_aarch64": "('cc')",
+    }
+
+
+def test_calculate_file_hash_in_memory():
+    """直接传入内存数据或文件对象"""
+    expected = hashlib.sha512(file_content).hexdigest()
+
+    assert calculate_file_hash(file_content) == expected
+    assert calculate_file_hash(memoryview(file_content)) == expected
+    assert calculate_file_hash(io.BytesIO(file_content)) == expected
+
+
+def test_calculate_file_hash_enum_algorithm(sample_file):
+    """算法可以传枚举，也可以传不区分大小写的字符串"""
+    expected = hashlib.sha256(file_content).hexdigest()
+
+    assert calculate_file_hash(sample_file, HashAlgorithmEnum.SHA256) == expected
+    assert calculate_file_hash(sample_file, "SHA256") == expected
+    assert verify_file_hash(sample_file, expected, HashAlgorithmEnum.SHA256)
+    assert calculate_multiple_hashes(sample_file, [HashAlgorithmEnum.SHA256]) == {
+        "sha256": expected
+    }
@@ -1,4 +1,7 @@
+import os
 import re
+import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
@@ -13,6 +16,43 @@ from utils.hash import (
     format_multiple_checksums_for_pkgbuild,
 )
 
+# PKGBUILD 中需要读写的字段都是 ASCII，直接在字节上匹配，省去整份文件的解码/编码
+PKGVER_PATTERN = re.compile(rb"^pkgver=(.*)$", re.MULTILINE)
+PKGREL_PATTERN = re.compile(rb"^pkgrel=(.*)$", re.MULTILINE)
+EPOCH_PATTERN = re.compile(rb"^epoch=(.*)$", re.MULTILINE)
+CHECKSUMS_PATTERN = re.compile(
+    rf"^((?:{'|'.join(HashAlgorithmEnum.get_all())})sums(?:_\w+)?)=\('(.*)'\)$".encode(),
+    re.MULTILINE,
+)
+
+
+@lru_cache(maxsize=None)
+def _array_field_pattern(field: str) -> re.Pattern[bytes]:
+    """
+    获取匹配数组字段整行的正则，如 source_x86_64=(...)
+
+    Args:
+        field: 字段名
+
+    Returns:
+        编译后的正则
+    """
+    return re.compile(rf"^{re.escape(field)}=\(.*\)$".encode(), re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def _quoted_field_pattern(field: str) -> re.Pattern[bytes]:
+    """
+    获取匹配单个带引号值的数组字段的正则，如 sha512sums_x86_64=('...')
+
+    Args:
+        field: 字段名
+
+    Returns:
+        编译后的正则，group(1) 为引号内的值
+    """
+    return re.compile(rf"^{re.escape(field)}=\('(.*)'\)$".encode(), re.MULTILINE)
+
 
 class PKGBUILDEditor:
     """
@@ -27,18 +67,58 @@ class PKGBUILDEditor:
             pkgbuild_path: PKGBUILD文件路径
         """
         self.pkgbuild_path = pkgbuild_path
-        self.content = ""
+        self.content = b""
         self._load_content()
 
     def _load_content(self) -> None:
-        """加载PKGBUILD文件内容"""
-        with open(self.pkgbuild_path, "r", encoding="utf-8") as f:
-            self.content = f.read()
+        """加载PKGBUILD文件内容（原始字节）"""
+        self.content = self.pkgbuild_path.read_bytes()
+        self._original_content = self.content
 
     def _save_content(self) -> None:
-        """保存PKGBUILD文件内容"""
-        with open(self.pkgbuild_path, "w", encoding="utf-8") as f:
-            f.write(self.content)
+        """保存PKGBUILD文件内容，内容未变化时不写入"""
+        if self.content == self._original_content:
+            return
+
+        # 先写临时文件再原子替换，避免写入中途失败时留下不完整的PKGBUILD
+        tmp_path = self.pkgbuild_path.with_name(f"{self.pkgbuild_path.name}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(self.content)
+                f.flush()
+                # 确保数据落盘后再替换，否则崩溃时可能得到空的PKGBUILD
+                os.fsync(f.fileno())
+            # 保留原文件的权限
+            shutil.copymode(self.pkgbuild_path, tmp_path)
+            os.replace(tmp_path, self.pkgbuild_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._original_content = self.content
+
+    def _replace(self, pattern: re.Pattern[bytes], replacement: str) -> None:
+        """
+        用给定文本替换所有匹配的行
+
+        Args:
+            pattern: 匹配整行的正则
+            replacement: 替换后的行内容
+        """
+        data = replacement.encode()
+        self.content = pattern.sub(lambda _: data, self.content)
+
+    def _search_value(self, pattern: re.Pattern[bytes]) -> str | None:
+        """
+        查找第一个匹配并返回 group(1)
+
+        Args:
+            pattern: 正则
+
+        Returns:
+            解码后的 group(1)，如果没有匹配则返回None
+        """
+        match = pattern.search(self.content)
+        return match.group(1).decode() if match else None
 
     def update_pkgver(self, new_version: str) -> None:
         """
@@ -47,9 +127,7 @@ class PKGBUILDEditor:
         Args:
             new_version: 新版本号
         """
-        pattern = r"^pkgver=.*$"
-        replacement = f"pkgver={new_version}"
-        self.content = re.sub(pattern, replacement, self.content, flags=re.MULTILINE)
+        self._replace(PKGVER_PATTERN, f"pkgver={new_version}")
 
     def update_pkgrel(self, new_pkgrel: int = 1) -> None:
         """
@@ -58,9 +136,7 @@ class PKGBUILDEditor:
         Args:
             new_pkgrel: 新的发布号，默认为1
         """
-        pattern = r"^pkgrel=.*$"
-        replacement = f"pkgrel={new_pkgrel}"
-        self.content = re.sub(pattern, replacement, self.content, flags=re.MULTILINE)
+        self._replace(PKGREL_PATTERN, f"pkgrel={new_pkgrel}")
 
     def update_epoch(self, new_epoch: int | None = None) -> None:
         """
@@ -73,18 +149,13 @@ class PKGBUILDEditor:
             return
 
         # 检查epoch字段是否存在
-        if re.search(r"^epoch=.*$", self.content, flags=re.MULTILINE):
-            pattern = r"^epoch=.*$"
-            replacement = f"epoch={new_epoch}"
-            self.content = re.sub(
-                pattern, replacement, self.content, flags=re.MULTILINE
-            )
+        if EPOCH_PATTERN.search(self.content):
+            self._replace(EPOCH_PATTERN, f"epoch={new_epoch}")
         else:
             # 如果不存在，在pkgver之前添加
-            pattern = r"^(pkgver=.*)$"
-            replacement = f"epoch={new_epoch}\n\1"
-            self.content = re.sub(
-                pattern, replacement, self.content, flags=re.MULTILINE
+            epoch_line = f"epoch={new_epoch}\n".encode()
+            self.content = PKGVER_PATTERN.sub(
+                lambda m: epoch_line + m.group(0), self.content
             )
 
     def update_sha512sums(self, new_checksum: str) -> None:
@@ -94,9 +165,9 @@ class PKGBUILDEditor:
         Args:
             new_checksum: 新的SHA512校验和
         """
-        pattern = r"^sha512sums=\(.*\)$"
-        replacement = f"sha512sums=('{new_checksum}')"
-        self.content = re.sub(pattern, replacement, self.content, flags=re.MULTILINE)
+        self._replace(
+            _array_field_pattern("sha512sums"), f"sha512sums=('{new_checksum}')"
+        )
 
     def update_arch_checksum(
         self,
@@ -112,9 +183,8 @@ class PKGBUILDEditor:
             new_checksum: 新的校验和
             hash_algorithm: 哈希算法，支持 'md5', 'sha1', 'sha256', 'sha512' 等，默认为 'sha512'
         """
-        pattern = f"^{hash_algorithm}sums_{arch}=\\(.*\\)$"
-        replacement = f"{hash_algorithm}sums_{arch}=('{new_checksum}')"
-        self.content = re.sub(pattern, replacement, self.content, flags=re.MULTILINE)
+        field = f"{hash_algorithm}sums_{arch}"
+        self._replace(_array_field_pattern(field), f"{field}=('{new_checksum}')")
 
     def update_source_url(self, arch: str, new_url: str) -> None:
         """
@@ -124,9 +194,8 @@ class PKGBUILDEditor:
             arch: 架构名称，如'x86_64', 'aarch64', 'loong64'
             new_url: 新的源码URL
         """
-        pattern = f"^source_{arch}=\\(.*\\)$"
-        replacement = f"source_{arch}=('{new_url}')"
-        self.content = re.sub(pattern, replacement, self.content, flags=re.MULTILINE)
+        field = f"source_{arch}"
+        self._replace(_array_field_pattern(field), f"{field}=('{new_url}')")
 
     def get_pkgver(self) -> str:
         """
@@ -135,8 +204,7 @@ class PKGBUILDEditor:
         Returns:
             当前的pkgver值
         """
-        match = re.search(r"^pkgver=(.*)$", self.content, flags=re.MULTILINE)
-        return match.group(1) if match else ""
+        return self._search_value(PKGVER_PATTERN) or ""
 
     def get_pkgrel(self) -> int:
         """
@@ -145,8 +213,8 @@ class PKGBUILDEditor:
         Returns:
             当前的pkgrel值
         """
-        match = re.search(r"^pkgrel=(.*)$", self.content, flags=re.MULTILINE)
-        return int(match.group(1)) if match else 1
+        pkgrel = self._search_value(PKGREL_PATTERN)
+        return int(pkgrel) if pkgrel is not None else 1
 
     def get_epoch(self) -> int | None:
         """
@@ -155,8 +223,8 @@ class PKGBUILDEditor:
         Returns:
             当前的epoch值，如果不存在则返回None
         """
-        match = re.search(r"^epoch=(.*)$", self.content, flags=re.MULTILINE)
-        return int(match.group(1)) if match else None
+        epoch = self._search_value(EPOCH_PATTERN)
+        return int(epoch) if epoch is not None else None
 
     def get_checksum(self, arch: str | None = None) -> str:
         """
@@ -168,13 +236,48 @@ class PKGBUILDEditor:
         Returns:
             当前的sha512sums值
         """
-        if arch:
-            pattern = f"^sha512sums_{arch}=\\('(.*)'\\)$"
-        else:
-            pattern = r"^sha512sums=\(\'(.*)\'\)$"
+        field = f"sha512sums_{arch}" if arch else "sha512sums"
+        return self._search_value(_quoted_field_pattern(field)) or ""
+
+    def get_source_url(self, arch: str) -> str:
+        """
+        获取特定架构的source URL
+
+        Args:
+            arch: 架构名称，如'x86_64', 'aarch64', 'loong64'
 
-        match = re.search(pattern, self.content, flags=re.MULTILINE)
-        return match.group(1) if match else ""
+        Returns:
+            当前的source URL，如果不存在或不是单个带引号的值则返回空字符串
+        """
+        return self._search_value(_quoted_field_pattern(f"source_{arch}")) or ""
+
+    def apply_updates(self, updates: dict[str, str]) -> None:
+        """
+        单次扫描PKGBUILD内容，批量替换多个字段的值
+
+        Args:
+            updates: 字段名到新值的映射，值为等号右侧的完整内容，
+                如 {"pkgver": "1.0", "sha512sums_x86_64": "('...')"}
+        """
+        if not updates:
+            return
+
+        lines = {
+            field.encode(): f"{field}={value}".encode()
+            for field, value in updates.items()
+        }
+        pattern = re.compile(
+            rf"^({'|'.join(map(re.escape, updates))})=(.*)$".encode(), re.MULTILINE
+        )
+
+        def replace(match: re.Match[bytes]) -> bytes:
+            field, value = match.groups()
+            # 跨行的数组字段只有首行会被匹配到，保持原样，与 update_* 方法的行为一致
+            if value.startswith(b"(") and not value.endswith(b")"):
+                return match.group(0)
+            return lines[field]
+
+        self.content = pattern.sub(replace, self.content)
 
     def update_all(
         self,
@@ -211,10 +314,9 @@ class PKGBUILDEditor:
             if hash_algorithm == HashAlgorithmEnum.SHA512.value:
                 self.update_sha512sums(generic_checksum)
             else:
-                pattern = f"^{hash_algorithm}sums=\\(.*\\)$"
-                replacement = f"{hash_algorithm}sums=('{generic_checksum}')"
-                self.content = re.sub(
-                    pattern, replacement, self.content, flags=re.MULTILINE
+                field = f"{hash_algorithm}sums"
+                self._replace(
+                    _array_field_pattern(field), f"{field}=('{generic_checksum}')"
                 )
 
         # 更新各架构的校验和和URL
@@ -249,25 +351,14 @@ class PKGBUILDEditor:
         checksum = calculate_file_hash(file_path, hash_algorithm)
 
         if arch:
-            if hash_algorithm == HashAlgorithmEnum.SHA512.value:
-                self.update_arch_checksum(arch, checksum)
-            else:
-                # 对于其他哈希算法，使用通用更新方法
-                pattern = f"^{hash_algorithm}sums_{arch}=\\(.*\\)$"
-                replacement = f"{hash_algorithm}sums_{arch}=('{checksum}')"
-                self.content = re.sub(
-                    pattern, replacement, self.content, flags=re.MULTILINE
-                )
+            self.update_arch_checksum(arch, checksum, hash_algorithm)
         else:
             if hash_algorithm == HashAlgorithmEnum.SHA512.value:
                 self.update_sha512sums(checksum)
             else:
                 # 对于其他哈希算法，使用通用更新方法
-                pattern = f"^{hash_algorithm}sums=\\(.*\\)$"
-                replacement = f"{hash_algorithm}sums=('{checksum}')"
-                self.content = re.sub(
-                    pattern, replacement, self.content, flags=re.MULTILINE
-                )
+                field = f"{hash_algorithm}sums"
+                self._replace(_array_field_pattern(field), f"{field}=('{checksum}')")
 
     def calculate_and_update_sha256(
         self, file_path: Union[str, Path], arch: str | None = None
@@ -361,20 +452,10 @@ class PKGBUILDEditor:
         """
         result = {}
 
-        # 获取通用校验和
-        for algo in HashAlgorithmEnum.get_all():
-            pattern = f"^{algo}sums=\\('(.*)'\\)$"
-            match = re.search(pattern, self.content, flags=re.MULTILINE)
-            if match:
-                result[f"{algo}sums"] = match.group(0)
-
-        # 获取各架构的校验和
-        for algo in HashAlgorithmEnum.get_all():
-            for arch in ["x86_64", "aarch64", "loong64", "i686", "armv7h"]:
-                pattern = f"^{algo}sums_{arch}=\\('(.*)'\\)$"
-                match = re.search(pattern, self.content, flags=re.MULTILINE)
-                if match:
-                    result[f"{algo}sums_{arch}"] = match.group(0)
+        # 一次扫描取出所有 <algo>sums 与 <algo>sums_<arch> 字段
+        for match in CHECKSUMS_PATTERN.finditer(self.content):
+            field = match.group(1).decode()
+            result.setdefault(field, match.group(0).decode())
 
         return result
 
@@ -388,15 +469,12 @@ class PKGBUILDEditor:
         Returns:
             包含所有格式化校验和的字典
         """
-        file_path = Path(file_path)
-        checksums = {}
-
-        # 计算所有支持的哈希值
-        for algorithm in HashAlgorithmEnum.get_all():
-            hash_value = calculate_file_hash(file_path, algorithm)
-            checksums[algorithm] = format_checksum_for_pkgbuild(hash_value)
-
-        return checksums
+        # 只读取一遍文件，计算默认的哈希值
+        hashes = calculate_multiple_hashes(file_path, HashAlgorithmEnum.get_defaults())
+        return {
+            algorithm: format_checksum_for_pkgbuild(hash_value, algo=algorithm)
+            for algorithm, hash_value in hashes.items()
+        }
 
     def get_all_checksums(self, file_path: Union[str, Path]) -> dict[str, str]:
         """
@@ -408,4 +486,4 @@ class PKGBUILDEditor:
         Returns:
             包含所有校验和的字典
         """
-        return calculate_multiple_hashes(file_path, HashAlgorithmEnum.get_all())
+        return calculate_multiple_hashes(file_path, HashAlgorithmEnum.get_defaults())
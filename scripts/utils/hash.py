@@ -1,51 +1,270 @@
+import asyncio
+import atexit
 import hashlib
+import hmac
+import mmap
+import os
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Union
-from constants.constants import HashAlgorithmEnum
+from typing import TYPE_CHECKING, Any, BinaryIO, Mapping, Union
+from constants.constants import DOWNLOAD_CHUNK_SIZE, HashAlgorithmEnum
 
+if TYPE_CHECKING:
+    import httpx
 
-def calculate_file_hash(
-    file_path: Union[str, Path], hash_algorithm: str = HashAlgorithmEnum.SHA512.value
-) -> str:
+# 超过该大小的文件通过 mmap 一次性交给哈希对象，省去逐块读取的 Python 循环
+MMAP_THRESHOLD = 10 * 1024 * 1024
+
+# hashlib 的 SHA 系列是否由 OpenSSL 提供，只有 OpenSSL 实现才会用到 SHA-NI/AVX2 等硬件加速
+OPENSSL_SHA_AVAILABLE = all(
+    getattr(hashlib, name).__name__.startswith("openssl_")
+    for name in (HashAlgorithmEnum.SHA256.value, HashAlgorithmEnum.SHA512.value)
+)
+if not OPENSSL_SHA_AVAILABLE:
+    warnings.warn("hashlib 未使用 OpenSSL 实现的 SHA 算法，大文件哈希会明显变慢")
+
+# 校验和只用于完整性校验，不涉及安全用途，跳过 FIPS 相关检查
+sha256_impl = partial(hashlib.sha256, usedforsecurity=False)
+sha512_impl = partial(hashlib.sha512, usedforsecurity=False)
+
+# 支持的哈希算法及其构造函数
+SUPPORTED_ALGORITHMS = {
+    HashAlgorithmEnum.SHA256.value: sha256_impl,
+    HashAlgorithmEnum.SHA512.value: sha512_impl,
+    HashAlgorithmEnum.B2.value: hashlib.blake2b,
+}
+# 各算法十六进制摘要的长度，用于在读取文件前排除明显错误的预期值
+HEX_DIGEST_LENGTHS = {
+    algorithm: factory().digest_size * 2
+    for algorithm, factory in SUPPORTED_ALGORITHMS.items()
+}
+HEX_DIGITS = frozenset("0123456789abcdef")
+
+# 文件哈希缓存的最大条目数
+HASH_CACHE_SIZE = 1024
+# 键为 (文件绝对路径, 算法, 大小, 修改时间, inode)，文件未变化时直接返回缓存的哈希值
+_hash_cache: OrderedDict[tuple, str] = OrderedDict()
+
+# 哈希算法参数，可以是枚举或算法名字符串（不区分大小写）
+HashAlgorithm = Union[HashAlgorithmEnum, str]
+
+
+def _normalize_algorithm(hash_algorithm: HashAlgorithm) -> str:
     """
-    计算文件的哈希值
+    将哈希算法参数规范化为小写算法名
+
+    枚举直接取值，只有字符串才需要转小写
 
     Args:
-        file_path: 文件路径
-        hash_algorithm: 哈希算法，支持 'sha256', 'sha512'
+        hash_algorithm: 哈希算法枚举或算法名
 
     Returns:
-        文件的哈希值字符串
+        小写的算法名，如 'sha512'
+    """
+    if isinstance(hash_algorithm, HashAlgorithmEnum):
+        return hash_algorithm.value
+    return hash_algorithm.lower()
 
-    Raises:
-        FileNotFoundError: 如果文件不存在
-        ValueError: 如果不支持指定的哈希算法
+
+def _new_hash(algorithm: str):
     """
-    file_path = Path(file_path)
+    创建哈希对象
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"文件不存在: {file_path}")
+    Args:
+        algorithm: 规范化后的算法名，支持 'sha256', 'sha512', 'b2'
 
-    # 支持的哈希算法
-    supported_algorithms = {
-        HashAlgorithmEnum.SHA256.value: hashlib.sha256,
-        HashAlgorithmEnum.SHA512.value: hashlib.sha512,
-    }
+    Returns:
+        hashlib 哈希对象
 
-    if hash_algorithm.lower() not in supported_algorithms:
+    Raises:
+        ValueError: 如果不支持指定的哈希算法
+    """
+    factory = SUPPORTED_ALGORITHMS.get(algorithm)
+    if factory is None:
         raise ValueError(
-            f"不支持的哈希算法: {hash_algorithm}，支持的算法: {list(supported_algorithms.keys())}"
+            f"不支持的哈希算法: {algorithm}，支持的算法: {list(SUPPORTED_ALGORITHMS)}"
         )
 
-    # 计算哈希值
-    hash_func = supported_algorithms[hash_algorithm.lower()]()
+    return factory()
+
+
+def _update_in_chunks(f: BinaryIO, hash_funcs: list) -> None:
+    """
+    分块读取文件并更新哈希对象
+
+    复用同一块缓冲区，readinto 直接写入，每个块不再分配新的 bytes 对象
 
-    with open(file_path, "rb") as f:
-        # 分块读取文件，避免大文件占用过多内存
-        for chunk in iter(lambda: f.read(4096), b""):
+    Args:
+        f: 以二进制模式打开的文件
+        hash_funcs: 需要更新的哈希对象
+    """
+    buffer = bytearray(DOWNLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    while n := f.readinto(buffer):
+        chunk = view[:n]
+        for hash_func in hash_funcs:
             hash_func.update(chunk)
 
-    return hash_func.hexdigest()
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """
+    向内核提示文件的访问方式，不支持 posix_fadvise 的平台上什么也不做
+
+    Args:
+        fd: 文件描述符
+        advice_name: os 模块中的提示常量名，如 'POSIX_FADV_SEQUENTIAL'
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, getattr(os, advice_name))
+    except OSError:
+        # 只是性能提示，失败不影响结果
+        pass
+
+
+def _write_all(f: BinaryIO, data: bytes) -> None:
+    """
+    将数据完整写入无缓冲文件
+
+    下载的块已经是 1 MiB，直接交给 os.write，省去 BufferedWriter 多拷贝一次到内部缓冲区；
+    无缓冲写入可能只写入一部分，通过 memoryview 切片继续写剩余部分，不产生新的 bytes
+
+    Args:
+        f: 以无缓冲二进制模式打开的文件
+        data: 要写入的数据
+    """
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view) :]
+
+
+def _write_and_hash(f: BinaryIO, hash_func: "hashlib._Hash", chunk: bytes) -> None:
+    """
+    写入一个数据块并更新哈希
+
+    Args:
+        f: 以无缓冲二进制模式打开的目标文件
+        hash_func: 哈希对象
+        chunk: 数据块
+    """
+    _write_all(f, chunk)
+    hash_func.update(chunk)
+
+
+def _hash_cache_key(file_path: Path, st: os.stat_result, algorithm: str) -> tuple:
+    """生成文件哈希缓存的键"""
+    return (
+        str(file_path.resolve()),
+        algorithm,
+        st.st_size,
+        st.st_mtime_ns,
+        st.st_ino,
+    )
+
+
+def _get_cached_hash(key: tuple) -> str | None:
+    """从缓存中获取哈希值"""
+    value = _hash_cache.get(key)
+    if value is not None:
+        _hash_cache.move_to_end(key)
+    return value
+
+
+def _set_cached_hash(key: tuple, value: str) -> None:
+    """写入缓存，超出容量时淘汰最久未使用的条目"""
+    _hash_cache[key] = value
+    _hash_cache.move_to_end(key)
+    while len(_hash_cache) > HASH_CACHE_SIZE:
+        _hash_cache.popitem(last=False)
+
+
+def clear_hash_cache(file_path: Union[str, Path, None] = None) -> None:
+    """
+    清除文件哈希缓存
+
+    Args:
+        file_path: 只清除该文件的缓存，为None时清除全部
+    """
+    if file_path is None:
+        _hash_cache.clear()
+        return
+
+    resolved = str(Path(file_path).resolve())
+    for key in [key for key in _hash_cache if key[0] == resolved]:
+        del _hash_cache[key]
+
+
+def calculate_file_hash(
+    file_path: Union[str, Path, BinaryIO, bytes, bytearray, memoryview],
+    hash_algorithm: HashAlgorithm = HashAlgorithmEnum.SHA512,
+) -> str:
+    """
+    计算文件的哈希值
+
+    Args:
+        file_path: 文件路径；也可以直接传入内存中的数据，或已打开的二进制文件对象，
+            从当前位置读到末尾，不会重新打开文件
+        hash_algorithm: 哈希算法枚举或算法名，支持 'sha256', 'sha512', 'b2'
+
+    Returns:
+        文件的哈希值字符串
+
+    Raises:
+        FileNotFoundError: 如果文件不存在
+        ValueError: 如果不支持指定的哈希算法
+    """
+    algorithm = _normalize_algorithm(hash_algorithm)
+
+    # 内存中的数据单次 update 即可
+    if isinstance(file_path, (bytes, bytearray, memoryview)):
+        hash_func = _new_hash(algorithm)
+        hash_func.update(file_path)
+        return hash_func.hexdigest()
+
+    # 已打开的文件对象直接读取，没有路径和修改时间可用，不走缓存
+    if hasattr(file_path, "read"):
+        hash_func = _new_hash(algorithm)
+        if hasattr(file_path, "readinto"):
+            _update_in_chunks(file_path, [hash_func])
+        else:
+            while chunk := file_path.read(DOWNLOAD_CHUNK_SIZE):
+                hash_func.update(chunk)
+        return hash_func.hexdigest()
+
+    file_path = Path(file_path)
+
+    try:
+        st = file_path.stat()
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"文件不存在: {file_path}") from e
+
+    hash_func = _new_hash(algorithm)
+
+    cache_key = _hash_cache_key(file_path, st, algorithm)
+    cached = _get_cached_hash(cache_key)
+    if cached is not None:
+        return cached
+
+    with open(file_path, "rb", buffering=0) as f:
+        # 顺序读取，内核会加大预读窗口
+        _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+        if st.st_size >= MMAP_THRESHOLD:
+            # 大文件映射到内存后单次 update，由页缓存顺序读入，不占用额外内存
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hash_func.update(mm)
+        else:
+            _update_in_chunks(f, [hash_func])
+        # 哈希完成后不会再读，释放页缓存，避免挤掉其他有用的缓存页
+        _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+
+    digest = hash_func.hexdigest()
+    _set_cached_hash(cache_key, digest)
+    return digest
 
 
 def calculate_sha512(file_path: Union[str, Path]) -> str:
@@ -58,7 +277,7 @@ def calculate_sha512(file_path: Union[str, Path]) -> str:
     Returns:
         文件的SHA512哈希值字符串
     """
-    return calculate_file_hash(file_path, HashAlgorithmEnum.SHA512.value)
+    return calculate_file_hash(file_path, HashAlgorithmEnum.SHA512)
 
 
 def calculate_sha256(file_path: Union[str, Path]) -> str:
@@ -71,11 +290,11 @@ def calculate_sha256(file_path: Union[str, Path]) -> str:
     Returns:
         文件的SHA256哈希值字符串
     """
-    return calculate_file_hash(file_path, HashAlgorithmEnum.SHA256.value)
+    return calculate_file_hash(file_path, HashAlgorithmEnum.SHA256)
 
 
 def calculate_multiple_hashes(
-    file_path: Union[str, Path], algorithms: list | None = None
+    file_path: Union[str, Path], algorithms: list[HashAlgorithm] | None = None
 ) -> dict[str, str]:
     """
     一次性计算文件的多种哈希值
@@ -85,22 +304,62 @@ def calculate_multiple_hashes(
         algorithms: 要计算的哈希算法列表，默认为 ['sha256', 'sha512']
 
     Returns:
-        包含各种哈希值的字典，键为算法名，值为哈希值
+        包含各种哈希值的字典，键为小写算法名，值为哈希值
     """
     if algorithms is None:
-        algorithms = [HashAlgorithmEnum.SHA256.value, HashAlgorithmEnum.SHA512.value]
+        algorithms = [HashAlgorithmEnum.SHA256, HashAlgorithmEnum.SHA512]
+    algorithms = [_normalize_algorithm(algorithm) for algorithm in algorithms]
+
+    file_path = Path(file_path)
+
+    try:
+        st = file_path.stat()
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"文件不存在: {file_path}") from e
 
-    results = {}
-    for algorithm in algorithms:
-        results[algorithm] = calculate_file_hash(file_path, algorithm)
+    hash_funcs = {algorithm: _new_hash(algorithm) for algorithm in algorithms}
 
+    cache_keys = {
+        algorithm: _hash_cache_key(file_path, st, algorithm) for algorithm in algorithms
+    }
+    cached = {
+        algorithm: _get_cached_hash(cache_key)
+        for algorithm, cache_key in cache_keys.items()
+    }
+    if all(value is not None for value in cached.values()):
+        return cached
+
+    # 只读取一遍文件，所有哈希对象共用同一份数据
+    with open(file_path, "rb", buffering=0) as f:
+        _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+        if st.st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # 各哈希对象互不依赖，且 update 大块数据时会释放 GIL，
+                # 每个算法一个线程，耗时取决于最慢的算法而非总和
+                with ThreadPoolExecutor(
+                    max_workers=max(len(hash_funcs), 1)
+                ) as executor:
+                    for future in [
+                        executor.submit(hash_func.update, mm)
+                        for hash_func in hash_funcs.values()
+                    ]:
+                        future.result()
+        else:
+            _update_in_chunks(f, list(hash_funcs.values()))
+        _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+
+    results = {
+        algorithm: hash_func.hexdigest() for algorithm, hash_func in hash_funcs.items()
+    }
+    for algorithm, digest in results.items():
+        _set_cached_hash(cache_keys[algorithm], digest)
     return results
 
 
 def verify_file_hash(
     file_path: Union[str, Path],
     expected_hash: str,
-    hash_algorithm: str = HashAlgorithmEnum.SHA512.value,
+    hash_algorithm: HashAlgorithm = HashAlgorithmEnum.SHA512,
 ) -> bool:
     """
     验证文件的哈希值是否匹配预期值
@@ -108,23 +367,77 @@ def verify_file_hash(
     Args:
         file_path: 文件路径
         expected_hash: 预期的哈希值
-        hash_algorithm: 哈希算法，默认为 'sha512'
+        hash_algorithm: 哈希算法枚举或算法名，默认为 'sha512'
 
     Returns:
         如果哈希值匹配返回True，否则返回False
     """
     try:
-        actual_hash = calculate_file_hash(file_path, hash_algorithm)
-        return actual_hash.lower() == expected_hash.lower()
-    except (FileNotFoundError, ValueError):
+        # hexdigest 已是小写，只需规范化预期值
+        expected = expected_hash.strip().lower()
+        # 长度或字符不合法的预期值不可能匹配，无需读取文件
+        algorithm = _normalize_algorithm(hash_algorithm)
+        expected_length = HEX_DIGEST_LENGTHS.get(algorithm)
+        if len(expected) != expected_length or not HEX_DIGITS.issuperset(expected):
+            return False
+
+        actual_hash = calculate_file_hash(file_path, algorithm)
+        return hmac.compare_digest(actual_hash, expected)
+    except (FileNotFoundError, ValueError, TypeError):
         return False
 
 
+@cache
+def _get_http_client() -> "httpx.Client":
+    """
+    获取同步下载共用的HTTP客户端
+
+    首次调用时创建，之后复用连接池，多次下载不必每次重新建立 TCP/TLS 连接；
+    安装了 h2 时启用 HTTP/2，同一主机的多个下载复用一条连接
+
+    Returns:
+        httpx.Client 实例
+    """
+    import httpx
+
+    client = httpx.Client(
+        http2=find_spec("h2") is not None,
+        timeout=httpx.Timeout(30.0),
+        limits=httpx.Limits(max_keepalive_connections=32),
+        follow_redirects=True,
+    )
+    atexit.register(client.close)
+    return client
+
+
+def _check_content_length(headers: Mapping[str, str], written: int) -> None:
+    """
+    检查写入的字节数是否与 Content-Length 一致
+
+    经过压缩编码的响应，Content-Length 是压缩后的大小，不做比较
+
+    Args:
+        headers: 响应头
+        written: 实际写入的字节数
+
+    Raises:
+        ValueError: 如果下载不完整
+    """
+    content_length = headers.get("Content-Length")
+    content_encoding = headers.get("Content-Encoding", "identity")
+    if (
+        content_length is not None
+        and content_encoding == "identity"
+        and int(content_length) != written
+    ):
+        raise ValueError(f"下载不完整: {written}/{content_length}")
+
+
 def download_and_verify(
     url: str,
     destination: Union[str, Path],
     expected_hash: str,
-    hash_algorithm: str = HashAlgorithmEnum.SHA512.value,
+    hash_algorithm: HashAlgorithm = HashAlgorithmEnum.SHA512,
 ) -> bool:
     """
     下载文件并验证其哈希值
@@ -133,52 +446,185 @@ def download_and_verify(
         url: 下载URL
         destination: 保存路径
         expected_hash: 预期的哈希值
-        hash_algorithm: 哈希算法，默认为 'sha512'
+        hash_algorithm: 哈希算法枚举或算法名，默认为 'sha512'
+
+    Returns:
+        如果下载成功且哈希值匹配返回True，否则返回False
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    # 目标文件将被覆盖，旧的哈希缓存不再有效
+    clear_hash_cache(destination)
+
+    try:
+        algorithm = _normalize_algorithm(hash_algorithm)
+        hash_func = _new_hash(algorithm)
+
+        # 下载文件，写入的同时计算哈希值，无需再读一遍文件
+        with _get_http_client().stream("GET", url) as response:
+            response.raise_for_status()
+            written = 0
+            with open(destination, "wb", buffering=0) as f:
+                for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    _write_and_hash(f, hash_func, chunk)
+                    written += len(chunk)
+
+            _check_content_length(response.headers, written)
+
+        # 验证哈希值
+        digest = hash_func.hexdigest()
+        if hmac.compare_digest(digest, expected_hash.strip().lower()):
+            # 缓存刚算出的哈希值，之后对该文件计算哈希时无需再读一遍
+            _set_cached_hash(
+                _hash_cache_key(destination, destination.stat(), algorithm), digest
+            )
+            return True
+    except Exception:
+        pass
+
+    # 如果下载或验证失败，删除可能已部分下载的文件
+    destination.unlink(missing_ok=True)
+    return False
+
+
+async def download_and_verify_async(
+    url: str,
+    destination: Union[str, Path],
+    expected_hash: str,
+    hash_algorithm: HashAlgorithm = HashAlgorithmEnum.SHA512,
+    client: "httpx.AsyncClient | None" = None,
+) -> bool:
+    """
+    异步下载文件并验证其哈希值
+
+    Args:
+        url: 下载URL
+        destination: 保存路径
+        expected_hash: 预期的哈希值
+        hash_algorithm: 哈希算法枚举或算法名，默认为 'sha512'
+        client: 复用的异步HTTP客户端，为None时临时创建
 
     Returns:
         如果下载成功且哈希值匹配返回True，否则返回False
     """
     import httpx
 
+    if client is None:
+        async with httpx.AsyncClient(follow_redirects=True) as own_client:
+            return await download_and_verify_async(
+                url, destination, expected_hash, hash_algorithm, own_client
+            )
+
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
+    # 目标文件将被覆盖，旧的哈希缓存不再有效
+    clear_hash_cache(destination)
 
     try:
-        # 下载文件
-        with httpx.stream("GET", url) as response:
-            response.raise_for_status()
-            with open(destination, "wb") as f:
-                for chunk in response.iter_bytes():
-                    f.write(chunk)
+        algorithm = _normalize_algorithm(hash_algorithm)
+        digest = await download_and_hash_async(client, url, destination, algorithm)
 
         # 验证哈希值
-        return verify_file_hash(destination, expected_hash, hash_algorithm)
+        if hmac.compare_digest(digest, expected_hash.strip().lower()):
+            # 缓存刚算出的哈希值，之后对该文件计算哈希时无需再读一遍
+            _set_cached_hash(
+                _hash_cache_key(destination, destination.stat(), algorithm), digest
+            )
+            return True
     except Exception:
-        # 如果下载或验证失败，删除可能已部分下载的文件
-        if destination.exists():
-            destination.unlink()
-        return False
+        pass
+
+    # 如果下载或验证失败，删除可能已部分下载的文件
+    destination.unlink(missing_ok=True)
+    return False
 
 
-def format_checksum_for_pkgbuild(checksum: str, arch: str | None = None) -> str:
+async def download_and_hash_async(
+    client: "httpx.AsyncClient",
+    url: str,
+    destination: Union[str, Path],
+    hash_algorithm: HashAlgorithm = HashAlgorithmEnum.SHA512,
+) -> str:
+    """
+    异步流式下载文件，写入的同时计算哈希值，无需再读一遍文件
+
+    Args:
+        client: 异步HTTP客户端
+        url: 下载URL
+        destination: 保存路径
+        hash_algorithm: 哈希算法枚举或算法名，默认为 'sha512'
+
+    Returns:
+        文件的哈希值字符串
+
+    Raises:
+        httpx.HTTPError: 如果请求失败
+        ValueError: 如果下载不完整或不支持指定的哈希算法
+    """
+    hash_func = _new_hash(_normalize_algorithm(hash_algorithm))
+
+    # 流式写入磁盘，避免把整个文件读入内存
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        written = 0
+        with open(destination, "wb", buffering=0) as f:
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                # 写文件是阻塞操作，hashlib 处理大块数据时会释放 GIL，
+                # 一起放到线程中执行，避免阻塞事件循环上的其他下载
+                await asyncio.to_thread(_write_and_hash, f, hash_func, chunk)
+                written += len(chunk)
+
+        _check_content_length(response.headers, written)
+
+    return hash_func.hexdigest()
+
+
+async def download_many(items: list[dict[str, Any]]) -> list[bool]:
+    """
+    并发下载多个文件并验证哈希值
+
+    Args:
+        items: 每项为 download_and_verify_async 的关键字参数，
+            如 {"url": ..., "destination": ..., "expected_hash": ...}
+
+    Returns:
+        与 items 顺序一致的验证结果列表
+    """
+    import httpx
+
+    # 所有下载共用一个客户端及其连接池
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        return await asyncio.gather(
+            *(download_and_verify_async(**item, client=client) for item in items)
+        )
+
+
+def format_checksum_for_pkgbuild(
+    checksum: str,
+    arch: str | None = None,
+    algo: str = HashAlgorithmEnum.SHA512.value,
+) -> str:
     """
     格式化校验和以用于PKGBUILD文件
 
     Args:
         checksum: 校验和字符串
         arch: 架构名称，如果为None则返回通用格式
+        algo: 校验和对应的哈希算法，决定字段名前缀，如 'sha512' 对应 sha512sums
 
     Returns:
         格式化后的校验和字符串，适用于PKGBUILD文件
     """
     if arch:
-        return f"{HashAlgorithmEnum.SHA512.value}sums_{arch}=('{checksum}')"
+        return f"{algo}sums_{arch}=('{checksum}')"
     else:
-        return f"{HashAlgorithmEnum.SHA512.value}sums=('{checksum}')"
+        return f"{algo}sums=('{checksum}')"
 
 
 def format_multiple_checksums_for_pkgbuild(
-    checksums: dict[str, str], generic_checksum: str | None = None
+    checksums: dict[str, str],
+    generic_checksum: str | None = None,
+    algo: str = HashAlgorithmEnum.SHA512.value,
 ) -> dict[str, str]:
     """
     格式化多个校验和以用于PKGBUILD文件
@@ -186,18 +632,20 @@ def format_multiple_checksums_for_pkgbuild(
     Args:
         checksums: 各架构的校验和，键为架构名，值为校验和
         generic_checksum: 通用校验和
+        algo: 校验和对应的哈希算法，决定字段名前缀，如 'sha512' 对应 sha512sums
 
     Returns:
         格式化后的校验和字典，适用于PKGBUILD文件
     """
-    result = {}
+    prefix = f"{algo}sums"
 
-    # 添加各架构的校验和
-    for arch, checksum in checksums.items():
-        result[f"sha512sums_{arch}"] = f"('{checksum}')"
+    # 各架构的校验和
+    result = {
+        f"{prefix}_{arch}": f"('{checksum}')" for arch, checksum in checksums.items()
+    }
 
     # 添加通用校验和
     if generic_checksum:
-        result["sha512sums"] = f"('{generic_checksum}')"
+        result[prefix] = f"('{generic_checksum}')"
 
     return result